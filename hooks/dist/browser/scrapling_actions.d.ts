@@ -12,6 +12,17 @@ export type ScraplingAction = {
     filename?: string;
     attribute?: string;
     timeout?: number;
+    until?: string;
+    until_kind?: 'selector' | 'url' | 'load_state';
+    type?: 'png' | 'jpeg';
+    quality?: number;
+    full_page?: boolean;
+    clip?: {
+        x: number;
+        y: number;
+        width: number;
+        height: number;
+    };
     position?: {
         x: number;
         y: number;
@@ -15,6 +15,8 @@ export type ScraplingRunnerConfig = {
     networkIdle?: boolean;
     userDataDir?: string;
     outputDir?: string;
+    fuseActions?: boolean;
+    async?: boolean;
 };
 export type ScraplingRunnerResult = {
     url: string;
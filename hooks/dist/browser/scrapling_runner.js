@@ -39,9 +39,11 @@ export async function runScrapling(config) {
         timeout: config.timeout || 45_000,
         solveCloudflare: config.solveCloudflare || false,
         realChrome: config.realChrome || false,
-        networkIdle: config.networkIdle !== false,
+        networkIdle: config.networkIdle,
         outputDir,
         userDataDir: config.userDataDir,
+        fuseActions: config.fuseActions || false,
+        async: config.async || false,
     };
     const configJson = JSON.stringify(executorConfig);
     return new Promise((resolve, reject) => {
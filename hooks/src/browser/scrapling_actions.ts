@@ -43,6 +43,12 @@ export type ScraplingAction = {
   filename?: string;
   attribute?: string;
   timeout?: number;
+  until?: string;
+  until_kind?: 'selector' | 'url' | 'load_state';
+  type?: 'png' | 'jpeg';
+  quality?: number;
+  full_page?: boolean;
+  clip?: { x: number; y: number; width: number; height: number };
   position?: { x: number; y: number };
   options?: Record<string, unknown>;
 };
@@ -100,7 +106,7 @@ export const SCRAPLING_ACTIONS: Record<
     description: 'Capture screenshot of current page state',
     playwrightMethod: 'page.screenshot',
     requiredParams: [],
-    optionalParams: ['filename', 'selector'],
+    optionalParams: ['filename', 'selector', 'type', 'quality', 'full_page', 'clip'],
     example: { action: 'screenshot', filename: 'page.png' },
     pythonTemplate: `page.screenshot(path='{filename}')`,
   },
@@ -169,11 +175,11 @@ export const SCRAPLING_ACTIONS: Record<
     pythonTemplate: `page.uncheck('{selector}')`,
   },
   wait: {
-    description: 'Wait for specified milliseconds',
+    description: 'Wait up to specified milliseconds, or until a selector/url/load state is reached',
     playwrightMethod: 'page.wait_for_timeout',
     requiredParams: ['value'],
-    optionalParams: [],
-    example: { action: 'wait', value: '2000' },
+    optionalParams: ['until', 'until_kind'],
+    example: { action: 'wait', value: '2000', until: '.loaded' },
     pythonTemplate: `page.wait_for_timeout({value})`,
   },
   wait_selector: {
@@ -234,11 +240,11 @@ export const SCRAPLING_ACTIONS: Record<
   },
   list_elements: {
     description: 'List all matching elements',
-    playwrightMethod: 'page.locator().all',
+    playwrightMethod: 'page.locator().evaluate_all',
     requiredParams: ['selector'],
     optionalParams: [],
     example: { action: 'list_elements', selector: 'button' },
-    pythonTemplate: `[el.inner_text() for el in page.locator('{selector}').all()]`,
+    pythonTemplate: `page.locator('{selector}').evaluate_all("(els) => els.slice(0, 50).map(e => Array.from(e.innerText || '').slice(0, 200).join('').trim())")`,
   },
   evaluate: {
     description: 'Execute JavaScript in page context',
@@ -361,6 +367,15 @@ export function validateActions(actions: ScraplingAction[]): {
 
 // #region Code Generation
 
+/**
+ * Python for a wait step with `until`, by until_kind; {value} caps the wait in ms
+ */
+const WAIT_UNTIL_TEMPLATES: Record<NonNullable<ScraplingAction['until_kind']>, string> = {
+  selector: `page.wait_for_selector('{until}', timeout={value})`,
+  url: `page.wait_for_url('{until}', timeout={value})`,
+  load_state: `page.wait_for_load_state('{until}', timeout={value})`,
+};
+
 /**
  * Generate Python page_action function from action sequence
  */
@@ -378,7 +393,11 @@ export function generatePythonPageAction(
       continue;
     }
 
-    let code = def.pythonTemplate;
+    let code =
+      action.action === 'wait' && action.until
+        ? WAIT_UNTIL_TEMPLATES[action.until_kind ?? 'selector']
+        : def.pythonTemplate;
+    code = code.replace('{until}', action.until || '');
     code = code.replace('{selector}', action.selector || '');
     code = code.replace('{value}', action.value || '');
     code = code.replace('{filename}', action.filename || `screenshot-${index}.png`);
@@ -6,13 +6,27 @@ Executes page actions from JSON input, used by hook automations.
 Usage:
     python scrapling_executor.py --url URL --actions '[...]' [options]
     echo '{"url": "...", "actions": [...]}' | python scrapling_executor.py --stdin
+    python scrapling_executor.py --daemon < jobs.ndjson
+
+Daemon mode reads one JSON config per line and writes one JSON result per line.
+It keeps a single Chromium alive and gives each job a fresh browser context, so
+batch callers should pipe all their jobs through one daemon instead of spawning
+Python + Chromium per URL.
 """
 
 import argparse
+import asyncio
 import json
+import os
+import re
 import sys
+import time
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Locator
 
 # Ensure UTF-8 output on Windows
 if sys.platform == 'win32':
@@ -20,216 +34,847 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+try:
+    import orjson
+
+    def _dumps(obj: Any, indent: bool = True) -> str:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=str).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any, indent: bool = True) -> str:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=str)
+
+    _loads = json.loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    """One page action; keys not listed here are ignored."""
+    action: str
+    selector: str | None = None
+    value: Any = None
+    filename: str | None = None
+    attribute: str | None = 'href'
+    timeout: float | None = None
+    until: str | None = None
+    until_kind: str = 'selector'
+    type: str | None = None
+    quality: int = 70
+    full_page: bool = False
+    clip: dict[str, float] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class InvalidStep:
+    """A step that failed validation; reported as that step's error instead of failing the job."""
+    action: Any
+    error: str
+
+
+_STEP_FIELDS = frozenset(f.name for f in fields(Step))
+
+
+def _to_step(raw: Any) -> Step | InvalidStep:
+    """Convert one parsed action to a Step.
+
+    msgspec checks every field's type when it is installed; without it Steps are built
+    with no type checks (as with orjson, the dependency is optional) and a bad value
+    surfaces as that step's Playwright error. Either way only the bad step fails.
+    """
+    if isinstance(raw, (Step, InvalidStep)):
+        return raw
+    if not isinstance(raw, dict):
+        return InvalidStep(None, f'Invalid step: expected an object, got {type(raw).__name__}')
+    action = raw.get('action')
+    if msgspec is not None:
+        try:
+            return msgspec.convert(raw, Step)
+        except msgspec.ValidationError as e:
+            return InvalidStep(action, f'Invalid step: {e}')
+    # The action name is still checked since it selects the handler
+    if not isinstance(action, str):
+        return InvalidStep(action, 'Invalid step: action must be a string')
+    return Step(**{k: v for k, v in raw.items() if k in _STEP_FIELDS})
+
+
+def _to_steps(actions: list) -> list[Step | InvalidStep]:
+    """Convert parsed actions to Steps; malformed entries become InvalidSteps."""
+    if not isinstance(actions, list):
+        raise ValueError(f'actions must be a JSON array, got {type(actions).__name__}')
+    return [_to_step(step) for step in actions]
+
+
+# Scrapling fetcher classes by method, imported on first use
+_FETCHER_CLASSES = {'stealthy-fetch': 'StealthyFetcher', 'fetch': 'DynamicFetcher', 'get': 'Fetcher'}
+_FETCHERS: dict[str, Any] = {}
+
+# Shared by daemon jobs; launched on first use
+_playwright = None
+_browser = None
+
+# Collects count and truncated texts in one round-trip instead of one per element handle;
+# Array.from slices by code point so astral characters are never split
+LIST_ELEMENTS_JS = '''(els) => ({
+    count: els.length,
+    texts: els.slice(0, 50).map(e => Array.from(e.innerText || '').slice(0, 200).join('').trim()),
+})'''
+
+# Truncates in the page (by code point) so long elements never cross the wire in full
+GET_TEXT_JS = "(e, n) => Array.from(e.innerText || '').slice(0, n).join('')"
+
+# In-page bodies for read-only actions that can be answered without the driver; each
+# receives (s, a) = (selector, attribute) and returns the extra result fields
+FUSED_ACTIONS_JS = {
+    'get_text': "return {selector: s, text: Array.from(q(s).innerText || '').slice(0, 1000).join('')};",
+    'get_attribute': "return {selector: s, attribute: a, value: q(s).getAttribute(a)};",
+    'get_value': "return {selector: s, value: q(s).value};",
+    'get_url': "return {url: location.href};",
+    'get_title': "return {title: document.title};",
+}
+
+FUSED_PRELUDE_JS = '''const results = [];
+    const q = (s) => {
+        const e = document.querySelector(s);
+        if (!e) throw new Error(`No element matches selector: ${s}`);
+        return e;
+    };
+    const run = (step, action, s, a, body) => {
+        try {
+            results.push({step, action, status: 'ok', ...body(s, a)});
+        } catch (e) {
+            results.push({step, action, status: 'error', error: String(e && e.message || e)});
+        }
+    };'''
+
+# Selector syntax only Playwright's engines understand (text=, xpath, chaining, its own pseudo-classes)
+_PLAYWRIGHT_SELECTOR_RE = re.compile(
+    r'^(?:[\w-]+=|//|\.\.|["\'])|>>'
+    r'|:(?:has-text|text|text-is|text-matches|visible|nth-match|left-of|right-of|above|below|near)\b'
+)
+
+
+def _try_fuse(actions: list[Step | InvalidStep]) -> str | None:
+    """Compile a read-only action list into one in-page script, or None if any step needs the driver.
+
+    Only side-effect-free steps on plain CSS selectors are fused, so nothing in the script can
+    navigate and any step it could not answer can safely be run again through Playwright.
+    """
+    if not actions:
+        return None
+    for step in actions:
+        if not isinstance(step, Step) or step.action not in FUSED_ACTIONS_JS:
+            return None
+        selector = step.selector
+        if selector is not None and (not isinstance(selector, str) or _PLAYWRIGHT_SELECTOR_RE.search(selector)):
+            return None
+
+    lines = []
+    for i, step in enumerate(actions):
+        args = ', '.join(json.dumps(arg, ensure_ascii=False) for arg in (i, step.action, step.selector, step.attribute))
+        lines.append(f'    run({args}, (s, a) => {{ {FUSED_ACTIONS_JS[step.action]} }});')
+
+    return '(() => {\n    ' + FUSED_PRELUDE_JS + '\n' + '\n'.join(lines) + '\n    return results;\n})()'
+
+
+def _opts(step: Step) -> dict[str, Any]:
+    return {'timeout': step.timeout} if step.timeout else {}
+
+
+def _locator(page, loc_cache: dict[str, 'Locator'], sel: str) -> 'Locator':
+    loc = loc_cache.get(sel)
+    if loc is None:
+        loc = loc_cache[sel] = page.locator(sel)
+    return loc
+
+
+def _screenshot_kwargs(step: Step, i: int, out_dir: str) -> dict[str, Any]:
+    filename = step.filename
+    shot_type = step.type
+    if not shot_type:
+        shot_type = 'jpeg' if filename and filename.lower().endswith(('.jpg', '.jpeg')) else 'png'
+    ext = 'jpg' if shot_type == 'jpeg' else 'png'
+    name = filename or f'screenshot-{i}.{ext}'
+    shot_kwargs: dict[str, Any] = {
+        # Path('.') / name drops the '.', so match that for the default output dir
+        'path': name if out_dir == '.' else os.path.join(out_dir, name),
+        'type': shot_type,
+        'full_page': step.full_page,
+    }
+    if shot_type == 'jpeg':
+        shot_kwargs['quality'] = step.quality
+    if step.clip:
+        shot_kwargs['clip'] = step.clip
+    return shot_kwargs
+
+
+# 'until_kind' of a wait step -> page method that ends the wait early
+_WAIT_UNTIL_METHODS = {
+    'selector': 'wait_for_selector',
+    'url': 'wait_for_url',
+    'load_state': 'wait_for_load_state',
+}
+
+
+def _wait_plan(step: Step) -> tuple[int, str | None]:
+    """Return the wait cap in ms and the page method to wait with (None for a fixed sleep)."""
+    value = step.value
+    ms = int(value) if value else 1000
+    if not step.until:
+        return ms, None
+    until_kind = step.until_kind
+    if until_kind not in _WAIT_UNTIL_METHODS:
+        raise ValueError(f'Unknown until_kind: {until_kind}')
+    return ms, _WAIT_UNTIL_METHODS[until_kind]
+
+
+# Each action handler runs one step and returns its result; exceptions are recorded by the caller.
+
+def _do_screenshot(page, step, i, out_dir, loc_cache):
+    shot_kwargs = _screenshot_kwargs(step, i, out_dir)
+    page.screenshot(**shot_kwargs)
+    return {'step': i, 'action': 'screenshot', 'status': 'ok', 'path': shot_kwargs['path']}
+
+
+def _do_click(page, step, i, out_dir, loc_cache):
+    page.click(step.selector, **_opts(step))
+    return {'step': i, 'action': 'click', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_fill(page, step, i, out_dir, loc_cache):
+    page.fill(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'fill', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_type(page, step, i, out_dir, loc_cache):
+    page.type(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'type', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_hover(page, step, i, out_dir, loc_cache):
+    page.hover(step.selector, **_opts(step))
+    return {'step': i, 'action': 'hover', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_press(page, step, i, out_dir, loc_cache):
+    page.press(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'press', 'status': 'ok', 'selector': step.selector, 'key': step.value}
+
+
+def _do_select(page, step, i, out_dir, loc_cache):
+    page.select_option(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'select', 'status': 'ok', 'selector': step.selector, 'value': step.value}
+
+
+def _do_check(page, step, i, out_dir, loc_cache):
+    page.check(step.selector, **_opts(step))
+    return {'step': i, 'action': 'check', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_uncheck(page, step, i, out_dir, loc_cache):
+    page.uncheck(step.selector, **_opts(step))
+    return {'step': i, 'action': 'uncheck', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_wait(page, step, i, out_dir, loc_cache):
+    # 'value' caps the wait; 'until' ends it early once the page is ready
+    ms, wait_method = _wait_plan(step)
+    started = time.monotonic()
+    if wait_method is None:
+        page.wait_for_timeout(ms)
+    else:
+        getattr(page, wait_method)(step.until, timeout=ms)
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+    return {'step': i, 'action': 'wait', 'status': 'ok', 'ms': ms, 'elapsed_ms': elapsed_ms}
+
+
+def _do_wait_selector(page, step, i, out_dir, loc_cache):
+    page.wait_for_selector(step.selector, **_opts(step))
+    return {'step': i, 'action': 'wait_selector', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_wait_url(page, step, i, out_dir, loc_cache):
+    page.wait_for_url(step.value, **_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'wait_url', 'status': 'ok', 'url_pattern': step.value}
+
+
+def _do_get_text(page, step, i, out_dir, loc_cache):
+    text = _locator(page, loc_cache, step.selector).first.evaluate(GET_TEXT_JS, 1000)
+    return {'step': i, 'action': 'get_text', 'status': 'ok', 'selector': step.selector, 'text': text}
+
+
+def _do_get_attribute(page, step, i, out_dir, loc_cache):
+    val = _locator(page, loc_cache, step.selector).first.get_attribute(step.attribute)
+    return {'step': i, 'action': 'get_attribute', 'status': 'ok', 'selector': step.selector, 'attribute': step.attribute, 'value': val}
+
+
+def _do_get_value(page, step, i, out_dir, loc_cache):
+    val = _locator(page, loc_cache, step.selector).first.input_value()
+    return {'step': i, 'action': 'get_value', 'status': 'ok', 'selector': step.selector, 'value': val}
+
+
+def _do_list_elements(page, step, i, out_dir, loc_cache):
+    listing = _locator(page, loc_cache, step.selector).evaluate_all(LIST_ELEMENTS_JS)
+    return {'step': i, 'action': 'list_elements', 'status': 'ok', 'selector': step.selector, 'count': listing['count'], 'texts': listing['texts']}
+
+
+def _do_evaluate(page, step, i, out_dir, loc_cache):
+    # Page.evaluate takes no timeout
+    result = page.evaluate(step.value)
+    return {'step': i, 'action': 'evaluate', 'status': 'ok', 'result': str(result)[:1000]}
+
+
+def _do_go_back(page, step, i, out_dir, loc_cache):
+    page.go_back(**_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'go_back', 'status': 'ok'}
 
-def create_page_action(actions: list[dict], output_dir: Path):
+
+def _do_go_forward(page, step, i, out_dir, loc_cache):
+    page.go_forward(**_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'go_forward', 'status': 'ok'}
+
+
+def _do_reload(page, step, i, out_dir, loc_cache):
+    page.reload(**_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'reload', 'status': 'ok'}
+
+
+def _do_scroll(page, step, i, out_dir, loc_cache):
+    _locator(page, loc_cache, step.selector).scroll_into_view_if_needed()
+    return {'step': i, 'action': 'scroll', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_focus(page, step, i, out_dir, loc_cache):
+    page.focus(step.selector, **_opts(step))
+    return {'step': i, 'action': 'focus', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_blur(page, step, i, out_dir, loc_cache):
+    _locator(page, loc_cache, step.selector).blur()
+    return {'step': i, 'action': 'blur', 'status': 'ok', 'selector': step.selector}
+
+
+def _do_drag(page, step, i, out_dir, loc_cache):
+    page.drag_and_drop(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'drag', 'status': 'ok', 'source': step.selector, 'target': step.value}
+
+
+def _do_upload_file(page, step, i, out_dir, loc_cache):
+    page.set_input_files(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'upload_file', 'status': 'ok', 'selector': step.selector, 'file': step.value}
+
+
+def _do_get_url(page, step, i, out_dir, loc_cache):
+    return {'step': i, 'action': 'get_url', 'status': 'ok', 'url': page.url}
+
+
+def _do_get_title(page, step, i, out_dir, loc_cache):
+    return {'step': i, 'action': 'get_title', 'status': 'ok', 'title': page.title()}
+
+
+_HANDLERS: dict[str, Callable[..., dict]] = {
+    'screenshot': _do_screenshot,
+    'click': _do_click,
+    'fill': _do_fill,
+    'type': _do_type,
+    'hover': _do_hover,
+    'press': _do_press,
+    'select': _do_select,
+    'check': _do_check,
+    'uncheck': _do_uncheck,
+    'wait': _do_wait,
+    'wait_selector': _do_wait_selector,
+    'wait_url': _do_wait_url,
+    'get_text': _do_get_text,
+    'get_attribute': _do_get_attribute,
+    'get_value': _do_get_value,
+    'list_elements': _do_list_elements,
+    'evaluate': _do_evaluate,
+    'go_back': _do_go_back,
+    'go_forward': _do_go_forward,
+    'reload': _do_reload,
+    'scroll': _do_scroll,
+    'focus': _do_focus,
+    'blur': _do_blur,
+    'drag': _do_drag,
+    'upload_file': _do_upload_file,
+    'get_url': _do_get_url,
+    'get_title': _do_get_title,
+}
+
+
+def _step_error(step: Step | InvalidStep, i: int) -> dict | None:
+    """The error entry for a step that cannot run at all, or None."""
+    if isinstance(step, InvalidStep):
+        return {'step': i, 'action': step.action, 'status': 'error', 'error': step.error}
+    if step.action not in _HANDLERS:
+        return {'step': i, 'action': step.action, 'status': 'error', 'error': f'Unknown action: {step.action}'}
+    return None
+
+
+def create_page_action(actions: list[Step | InvalidStep], output_dir: Path, fuse: bool = False):
     """Create a page_action function from action list."""
     results: list[dict] = []
+    fused_script = _try_fuse(actions) if fuse else None
+    out_str = str(output_dir)
+    loc_cache: dict[str, 'Locator'] = {}
+    # Resolve each step's handler (or the error it reports instead) once, not per run
+    plan = []
+    for i, step in enumerate(actions):
+        error = _step_error(step, i)
+        plan.append((step, None if error else _HANDLERS[step.action], error))
 
     def page_action(page):
         nonlocal results
-        for i, step in enumerate(actions):
-            action = step.get('action')
-            selector = step.get('selector')
-            value = step.get('value')
-            filename = step.get('filename')
-            attribute = step.get('attribute', 'href')
-            timeout = step.get('timeout')
-
+        loc_cache.clear()
+        append = results.append
+
+        fused = run_fused(page) if fused_script else None
+        for i, (step, handler, error) in enumerate(plan):
+            if fused is not None and fused[i]['status'] == 'ok':
+                append(fused[i])
+                continue
+            if handler is None:
+                append(error)
+                continue
             try:
-                if action == 'screenshot':
-                    path = output_dir / (filename or f'screenshot-{i}.png')
-                    page.screenshot(path=str(path))
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'path': str(path)})
-
-                elif action == 'click':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.click(selector, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'fill':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.fill(selector, value, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'type':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.type(selector, value, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'hover':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.hover(selector, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'press':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.press(selector, value, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector, 'key': value})
-
-                elif action == 'select':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.select_option(selector, value, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector, 'value': value})
-
-                elif action == 'check':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.check(selector, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'uncheck':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.uncheck(selector, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'wait':
-                    ms = int(value) if value else 1000
-                    page.wait_for_timeout(ms)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'ms': ms})
-
-                elif action == 'wait_selector':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.wait_for_selector(selector, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'wait_url':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.wait_for_url(value, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'url_pattern': value})
-
-                elif action == 'get_text':
-                    text = page.locator(selector).first.inner_text()
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector, 'text': text[:1000]})
-
-                elif action == 'get_attribute':
-                    val = page.locator(selector).first.get_attribute(attribute)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector, 'attribute': attribute, 'value': val})
-
-                elif action == 'get_value':
-                    val = page.locator(selector).first.input_value()
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector, 'value': val})
-
-                elif action == 'list_elements':
-                    elements = page.locator(selector).all()
-                    texts = []
-                    for el in elements[:50]:
-                        try:
-                            texts.append(el.inner_text()[:200].strip())
-                        except Exception:
-                            texts.append('[no text]')
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector, 'count': len(elements), 'texts': texts})
-
-                elif action == 'evaluate':
-                    result = page.evaluate(value)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'result': str(result)[:1000]})
-
-                elif action == 'go_back':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.go_back(**opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok'})
-
-                elif action == 'go_forward':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.go_forward(**opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok'})
-
-                elif action == 'reload':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.reload(**opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok'})
-
-                elif action == 'scroll':
-                    page.locator(selector).scroll_into_view_if_needed()
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'focus':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.focus(selector, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'blur':
-                    page.locator(selector).blur()
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector})
-
-                elif action == 'drag':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.drag_and_drop(selector, value, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'source': selector, 'target': value})
-
-                elif action == 'upload_file':
-                    opts = {'timeout': timeout} if timeout else {}
-                    page.set_input_files(selector, value, **opts)
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'selector': selector, 'file': value})
-
-                elif action == 'get_url':
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'url': page.url})
-
-                elif action == 'get_title':
-                    results.append({'step': i, 'action': action, 'status': 'ok', 'title': page.title()})
-
-                else:
-                    results.append({'step': i, 'action': action, 'status': 'error', 'error': f'Unknown action: {action}'})
-
+                append(handler(page, step, i, out_str, loc_cache))
             except Exception as e:
-                results.append({'step': i, 'action': action, 'status': 'error', 'error': str(e)})
+                append({'step': i, 'action': step.action, 'status': 'error', 'error': str(e)})
+        return results
+
+    def run_fused(page) -> list[dict] | None:
+        """Answer every step with the fused script; steps it could not answer go through Playwright."""
+        try:
+            page.wait_for_load_state('domcontentloaded')
+            return page.evaluate(fused_script)
+        except Exception:
+            return None  # the steps are read-only, so driving all of them is always safe
+
+    return page_action, lambda: results
+
+
+# Side-effect-free actions; consecutive runs of these are issued concurrently in async mode
+READ_ONLY_ACTIONS = frozenset({'get_text', 'get_attribute', 'get_value', 'get_url', 'get_title'})
+
+
+# Async twins of the _do_* handlers for Playwright's async API; each returns its result.
+
+async def _ado_screenshot(page, step, i, out_dir, loc_cache):
+    shot_kwargs = _screenshot_kwargs(step, i, out_dir)
+    await page.screenshot(**shot_kwargs)
+    return {'step': i, 'action': 'screenshot', 'status': 'ok', 'path': shot_kwargs['path']}
+
+
+async def _ado_click(page, step, i, out_dir, loc_cache):
+    await page.click(step.selector, **_opts(step))
+    return {'step': i, 'action': 'click', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_fill(page, step, i, out_dir, loc_cache):
+    await page.fill(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'fill', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_type(page, step, i, out_dir, loc_cache):
+    await page.type(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'type', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_hover(page, step, i, out_dir, loc_cache):
+    await page.hover(step.selector, **_opts(step))
+    return {'step': i, 'action': 'hover', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_press(page, step, i, out_dir, loc_cache):
+    await page.press(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'press', 'status': 'ok', 'selector': step.selector, 'key': step.value}
+
+
+async def _ado_select(page, step, i, out_dir, loc_cache):
+    await page.select_option(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'select', 'status': 'ok', 'selector': step.selector, 'value': step.value}
 
+
+async def _ado_check(page, step, i, out_dir, loc_cache):
+    await page.check(step.selector, **_opts(step))
+    return {'step': i, 'action': 'check', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_uncheck(page, step, i, out_dir, loc_cache):
+    await page.uncheck(step.selector, **_opts(step))
+    return {'step': i, 'action': 'uncheck', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_wait(page, step, i, out_dir, loc_cache):
+    ms, wait_method = _wait_plan(step)
+    started = time.monotonic()
+    if wait_method is None:
+        await page.wait_for_timeout(ms)
+    else:
+        await getattr(page, wait_method)(step.until, timeout=ms)
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+    return {'step': i, 'action': 'wait', 'status': 'ok', 'ms': ms, 'elapsed_ms': elapsed_ms}
+
+
+async def _ado_wait_selector(page, step, i, out_dir, loc_cache):
+    await page.wait_for_selector(step.selector, **_opts(step))
+    return {'step': i, 'action': 'wait_selector', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_wait_url(page, step, i, out_dir, loc_cache):
+    await page.wait_for_url(step.value, **_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'wait_url', 'status': 'ok', 'url_pattern': step.value}
+
+
+async def _ado_get_text(page, step, i, out_dir, loc_cache):
+    text = await _locator(page, loc_cache, step.selector).first.evaluate(GET_TEXT_JS, 1000)
+    return {'step': i, 'action': 'get_text', 'status': 'ok', 'selector': step.selector, 'text': text}
+
+
+async def _ado_get_attribute(page, step, i, out_dir, loc_cache):
+    val = await _locator(page, loc_cache, step.selector).first.get_attribute(step.attribute)
+    return {'step': i, 'action': 'get_attribute', 'status': 'ok', 'selector': step.selector, 'attribute': step.attribute, 'value': val}
+
+
+async def _ado_get_value(page, step, i, out_dir, loc_cache):
+    val = await _locator(page, loc_cache, step.selector).first.input_value()
+    return {'step': i, 'action': 'get_value', 'status': 'ok', 'selector': step.selector, 'value': val}
+
+
+async def _ado_list_elements(page, step, i, out_dir, loc_cache):
+    listing = await _locator(page, loc_cache, step.selector).evaluate_all(LIST_ELEMENTS_JS)
+    return {'step': i, 'action': 'list_elements', 'status': 'ok', 'selector': step.selector, 'count': listing['count'], 'texts': listing['texts']}
+
+
+async def _ado_evaluate(page, step, i, out_dir, loc_cache):
+    result = await page.evaluate(step.value)
+    return {'step': i, 'action': 'evaluate', 'status': 'ok', 'result': str(result)[:1000]}
+
+
+async def _ado_go_back(page, step, i, out_dir, loc_cache):
+    await page.go_back(**_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'go_back', 'status': 'ok'}
+
+
+async def _ado_go_forward(page, step, i, out_dir, loc_cache):
+    await page.go_forward(**_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'go_forward', 'status': 'ok'}
+
+
+async def _ado_reload(page, step, i, out_dir, loc_cache):
+    await page.reload(**_opts(step))
+    loc_cache.clear()
+    return {'step': i, 'action': 'reload', 'status': 'ok'}
+
+
+async def _ado_scroll(page, step, i, out_dir, loc_cache):
+    await _locator(page, loc_cache, step.selector).scroll_into_view_if_needed()
+    return {'step': i, 'action': 'scroll', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_focus(page, step, i, out_dir, loc_cache):
+    await page.focus(step.selector, **_opts(step))
+    return {'step': i, 'action': 'focus', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_blur(page, step, i, out_dir, loc_cache):
+    await _locator(page, loc_cache, step.selector).blur()
+    return {'step': i, 'action': 'blur', 'status': 'ok', 'selector': step.selector}
+
+
+async def _ado_drag(page, step, i, out_dir, loc_cache):
+    await page.drag_and_drop(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'drag', 'status': 'ok', 'source': step.selector, 'target': step.value}
+
+
+async def _ado_upload_file(page, step, i, out_dir, loc_cache):
+    await page.set_input_files(step.selector, step.value, **_opts(step))
+    return {'step': i, 'action': 'upload_file', 'status': 'ok', 'selector': step.selector, 'file': step.value}
+
+
+async def _ado_get_url(page, step, i, out_dir, loc_cache):
+    return {'step': i, 'action': 'get_url', 'status': 'ok', 'url': page.url}
+
+
+async def _ado_get_title(page, step, i, out_dir, loc_cache):
+    return {'step': i, 'action': 'get_title', 'status': 'ok', 'title': await page.title()}
+
+
+_AHANDLERS: dict[str, Callable[..., Awaitable[dict]]] = {
+    'screenshot': _ado_screenshot,
+    'click': _ado_click,
+    'fill': _ado_fill,
+    'type': _ado_type,
+    'hover': _ado_hover,
+    'press': _ado_press,
+    'select': _ado_select,
+    'check': _ado_check,
+    'uncheck': _ado_uncheck,
+    'wait': _ado_wait,
+    'wait_selector': _ado_wait_selector,
+    'wait_url': _ado_wait_url,
+    'get_text': _ado_get_text,
+    'get_attribute': _ado_get_attribute,
+    'get_value': _ado_get_value,
+    'list_elements': _ado_list_elements,
+    'evaluate': _ado_evaluate,
+    'go_back': _ado_go_back,
+    'go_forward': _ado_go_forward,
+    'reload': _ado_reload,
+    'scroll': _ado_scroll,
+    'focus': _ado_focus,
+    'blur': _ado_blur,
+    'drag': _ado_drag,
+    'upload_file': _ado_upload_file,
+    'get_url': _ado_get_url,
+    'get_title': _ado_get_title,
+}
+
+
+async def _run_step_async(page, step: Step | InvalidStep, i: int, out_dir: str, loc_cache: dict[str, 'Locator']) -> dict:
+    error = _step_error(step, i)
+    if error is not None:
+        return error
+    try:
+        return await _AHANDLERS[step.action](page, step, i, out_dir, loc_cache)
+    except Exception as e:
+        return {'step': i, 'action': step.action, 'status': 'error', 'error': str(e)}
+
+
+def create_page_action_async(actions: list[Step | InvalidStep], output_dir: Path):
+    """Create an async page_action that reads runs of read-only steps concurrently."""
+    results: list[dict] = []
+    out_str = str(output_dir)
+    loc_cache: dict[str, 'Locator'] = {}
+
+    async def page_action(page):
+        loc_cache.clear()
+        n = len(actions)
+        i = 0
+        while i < n:
+            end = i
+            while end < n and isinstance(actions[end], Step) and actions[end].action in READ_ONLY_ACTIONS:
+                end += 1
+            if end - i > 1:
+                results.extend(await asyncio.gather(
+                    *(_run_step_async(page, actions[k], k, out_str, loc_cache) for k in range(i, end))
+                ))
+                i = end
+            else:
+                results.append(await _run_step_async(page, actions[i], i, out_str, loc_cache))
+                i += 1
         return results
 
     return page_action, lambda: results
 
 
+# Steps that load a new document and so benefit from waiting for network idle
+NAVIGATION_ACTIONS = frozenset({'reload', 'go_back', 'go_forward', 'wait_url'})
+
+
+def _needs_network_idle(config: dict[str, Any], actions: list[Step | InvalidStep]) -> bool:
+    """Honor an explicit networkIdle; otherwise only wait for idle when the actions navigate."""
+    if config.get('networkIdle') is not None:
+        return config['networkIdle']
+    if config.get('forceNetworkIdle'):
+        return True
+    return any(isinstance(step, Step) and step.action in NAVIGATION_ACTIONS for step in actions)
+
+
+# Marker file in userDataDir recording a recent Cloudflare solve for that profile
+CF_MARKER = '.cf_ok'
+CF_MARKER_TTL = 30 * 60
+CF_BLOCKED_STATUSES = frozenset({403, 429, 503})
+
+
+def _cf_marker_fresh(marker: str) -> bool:
+    try:
+        return time.time() - os.path.getmtime(marker) < CF_MARKER_TTL
+    except OSError:
+        return False
+
+
+def _remove_cf_marker(marker: str):
+    try:
+        os.remove(marker)
+    except OSError:
+        pass
+
+
+def _get_fetcher(method: str):
+    """Import the Scrapling fetcher class for a method once and reuse it."""
+    fetcher = _FETCHERS.get(method)
+    if fetcher is None:
+        import scrapling
+        fetcher = _FETCHERS[method] = getattr(scrapling, _FETCHER_CLASSES.get(method, 'Fetcher'))
+    return fetcher
+
+
 def execute(config: dict[str, Any]) -> dict[str, Any]:
     """Execute Scrapling session from config."""
     url = config['url']
-    actions = config.get('actions', [])
+    actions = _to_steps(config.get('actions', []))
     method = config.get('method', 'stealthy-fetch')
     headless = config.get('headless', True)
     timeout = config.get('timeout', 45000)
     solve_cloudflare = config.get('solveCloudflare', False)
     real_chrome = config.get('realChrome', False)
-    network_idle = config.get('networkIdle', True)
+    network_idle = _needs_network_idle(config, actions)
     output_dir = Path(config.get('outputDir', '.'))
     user_data_dir = config.get('userDataDir')
+    fuse_actions = config.get('fuseActions', False)
+    use_async = config.get('async', False)
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    page_action, get_results = create_page_action(actions, output_dir)
-
-    fetch_kwargs: dict[str, Any] = {
-        'headless': headless,
-        'page_action': page_action,
-        'timeout': timeout,
-        'network_idle': network_idle,
-    }
+    fetcher = _get_fetcher(method)
+    use_async = use_async and hasattr(fetcher, 'async_fetch')
 
+    extra_kwargs: dict[str, Any] = {}
     if real_chrome:
-        fetch_kwargs['real_chrome'] = True
+        extra_kwargs['real_chrome'] = True
     if user_data_dir:
-        fetch_kwargs['user_data_dir'] = user_data_dir
-
-    if method == 'stealthy-fetch':
-        from scrapling import StealthyFetcher
-        if solve_cloudflare:
+        extra_kwargs['user_data_dir'] = user_data_dir
+
+    def browser_fetch(solve: bool):
+        # The async path always drives steps through Playwright, so fuseActions does not apply
+        if use_async:
+            page_action, get_results = create_page_action_async(actions, output_dir)
+        else:
+            page_action, get_results = create_page_action(actions, output_dir, fuse=fuse_actions)
+        fetch_kwargs: dict[str, Any] = {
+            'headless': headless,
+            'page_action': page_action,
+            'timeout': timeout,
+            'network_idle': network_idle,
+            **extra_kwargs,
+        }
+        if solve:
             fetch_kwargs['solve_cloudflare'] = True
-        response = StealthyFetcher.fetch(url, **fetch_kwargs)
-    elif method == 'fetch':
-        from scrapling import DynamicFetcher
-        response = DynamicFetcher.fetch(url, **fetch_kwargs)
+        if use_async:
+            response = asyncio.run(fetcher.async_fetch(url, **fetch_kwargs))
+        else:
+            response = fetcher.fetch(url, **fetch_kwargs)
+        return response, get_results()
+
+    if method in ('stealthy-fetch', 'fetch'):
+        solve = method == 'stealthy-fetch' and solve_cloudflare
+        # A recent solve in this profile left a clearance cookie behind; try without solving first
+        cf_marker = os.path.join(user_data_dir, CF_MARKER) if solve and user_data_dir else None
+        if cf_marker and _cf_marker_fresh(cf_marker):
+            try:
+                response, action_results = browser_fetch(solve=False)
+            except Exception:
+                response = None  # e.g. a challenge page broke the actions; solve from scratch
+            if response is None or response.status in CF_BLOCKED_STATUSES:
+                _remove_cf_marker(cf_marker)
+                response, action_results = browser_fetch(solve=True)
+            else:
+                cf_marker = None  # reused the existing clearance; keep the marker's age
+        else:
+            response, action_results = browser_fetch(solve=solve)
+        if cf_marker and response.status not in CF_BLOCKED_STATUSES:
+            Path(cf_marker).touch()
     else:
-        from scrapling import Fetcher
-        del fetch_kwargs['page_action']
-        del fetch_kwargs['network_idle']
-        fetch_kwargs['timeout'] = timeout // 1000
-        response = Fetcher.get(url, **fetch_kwargs)
+        get_kwargs = {'headless': headless, 'timeout': timeout // 1000, **extra_kwargs}
+        response = fetcher.get(url, **get_kwargs)
+        action_results: list[dict] = []
 
     return {
         'url': url,
         'finalUrl': response.url if hasattr(response, 'url') else url,
         'status': response.status,
         'method': method,
+        'actions': action_results,
+    }
+
+
+def _get_browser(headless: bool = True):
+    """Launch the shared daemon browser on first use."""
+    global _playwright, _browser
+    if _browser is None:
+        from playwright.sync_api import sync_playwright
+        _playwright = sync_playwright().start()
+        _browser = _playwright.chromium.launch(headless=headless)
+    return _browser
+
+
+def _close_browser():
+    global _playwright, _browser
+    if _browser is not None:
+        _browser.close()
+        _browser = None
+    if _playwright is not None:
+        _playwright.stop()
+        _playwright = None
+
+
+def execute_with_ctx(ctx, config: dict[str, Any]) -> dict[str, Any]:
+    """Execute one daemon job in an already-open browser context."""
+    url = config['url']
+    actions = _to_steps(config.get('actions', []))
+    timeout = config.get('timeout', 45000)
+    network_idle = _needs_network_idle(config, actions)
+    output_dir = Path(config.get('outputDir', '.'))
+    fuse_actions = config.get('fuseActions', False)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    page_action, get_results = create_page_action(actions, output_dir, fuse=fuse_actions)
+
+    page = ctx.new_page()
+    response = page.goto(url, timeout=timeout, wait_until='networkidle' if network_idle else 'load')
+    page_action(page)
+
+    return {
+        'url': url,
+        'finalUrl': page.url,
+        'status': response.status if response else 0,
+        'method': 'daemon',
         'actions': get_results(),
     }
 
 
+def run_daemon():
+    """Serve NDJSON jobs from stdin with one long-lived browser.
+
+    Stealth options (method, solveCloudflare, realChrome, userDataDir) do not
+    apply here; headless is taken from the first job.
+    """
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                config = _loads(line)
+                ctx = _get_browser(config.get('headless', True)).new_context()
+                try:
+                    result = execute_with_ctx(ctx, config)
+                finally:
+                    ctx.close()
+                out = _dumps(result, indent=False)
+            except Exception as e:
+                out = _dumps({'error': str(e)}, indent=False)
+            print(out, flush=True)
+    finally:
+        _close_browser()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Scrapling Executor for Hook Automations')
     parser.add_argument('--url', help='URL to fetch')
@@ -240,31 +885,41 @@ def main():
     parser.add_argument('--timeout', type=int, default=45000)
     parser.add_argument('--solve-cloudflare', action='store_true')
     parser.add_argument('--real-chrome', action='store_true')
-    parser.add_argument('--network-idle', action='store_true', default=True)
+    parser.add_argument('--network-idle', action='store_true', default=None)
+    parser.add_argument('--no-network-idle', action='store_true')
     parser.add_argument('--output-dir', default='.')
     parser.add_argument('--user-data-dir')
+    parser.add_argument('--fuse-actions', action='store_true', help='Answer read-only action lists (get_* on CSS selectors) with one in-page script')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Use the async fetcher and read independent get_* steps concurrently (--fuse-actions is ignored in this mode)')
     parser.add_argument('--stdin', action='store_true', help='Read config from stdin as JSON')
     parser.add_argument('--config', help='Path to JSON config file')
+    parser.add_argument('--daemon', action='store_true', help='Serve NDJSON jobs from stdin with one shared browser')
 
     args = parser.parse_args()
 
+    if args.daemon:
+        run_daemon()
+        return
+
     if args.stdin:
-        config = json.load(sys.stdin)
+        config = _loads(sys.stdin.read())
     elif args.config:
-        with open(args.config) as f:
-            config = json.load(f)
+        with open(args.config, 'rb') as f:
+            config = _loads(f.read())
     elif args.url:
         config = {
             'url': args.url,
-            'actions': json.loads(args.actions) if args.actions else [],
+            'actions': _loads(args.actions) if args.actions else [],
             'method': args.method,
             'headless': not args.no_headless,
             'timeout': args.timeout,
             'solveCloudflare': args.solve_cloudflare,
             'realChrome': args.real_chrome,
-            'networkIdle': args.network_idle,
+            'networkIdle': False if args.no_network_idle else args.network_idle,
             'outputDir': args.output_dir,
             'userDataDir': args.user_data_dir,
+            'fuseActions': args.fuse_actions,
+            'async': args.use_async,
         }
     else:
         parser.print_help()
@@ -272,9 +927,9 @@ def main():
 
     try:
         result = execute(config)
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        print(_dumps(result))
     except Exception as e:
-        print(json.dumps({'error': str(e)}, indent=2), file=sys.stderr)
+        print(_dumps({'error': str(e)}), file=sys.stderr)
         sys.exit(1)
 
 
@@ -30,6 +30,8 @@ export type ScraplingRunnerConfig = {
   networkIdle?: boolean;
   userDataDir?: string;
   outputDir?: string;
+  fuseActions?: boolean;
+  async?: boolean;
 };
 
 export type ScraplingRunnerResult = {
@@ -85,9 +87,11 @@ export async function runScrapling(config: ScraplingRunnerConfig): Promise<Scrap
     timeout: config.timeout || 45_000,
     solveCloudflare: config.solveCloudflare || false,
     realChrome: config.realChrome || false,
-    networkIdle: config.networkIdle !== false,
+    networkIdle: config.networkIdle,
     outputDir,
     userDataDir: config.userDataDir,
+    fuseActions: config.fuseActions || false,
+    async: config.async || false,
   };
 
   const configJson = JSON.stringify(executorConfig);
@@ -0,0 +1,23 @@
+/**
+ * Scrapling Executor Tests
+ * Runs the Python unittest suite in test_scrapling_executor.py (stub pages and fetchers, no browser)
+ */
+
+import { spawnSync } from 'node:child_process';
+import { fileURLToPath } from 'node:url';
+import * as path from 'node:path';
+import { describe, it, expect } from 'vitest';
+
+const testsDir = path.dirname(fileURLToPath(import.meta.url));
+const python = process.platform === 'win32' ? 'python' : 'python3';
+const hasPython = spawnSync(python, ['--version']).status === 0;
+
+describe('scrapling_executor.py', () => {
+  it.skipIf(!hasPython)('passes its unittest suite', () => {
+    const run = spawnSync(python, ['-m', 'unittest', 'discover', '-s', testsDir], {
+      encoding: 'utf8',
+    });
+
+    expect(run.status, run.stderr).toBe(0);
+  });
+});
@@ -0,0 +1,333 @@
+"""
+Scrapling Executor Tests
+
+Runs the executor against stub pages and fetchers, so no browser is needed:
+    python3 -m unittest discover -s tests/browser
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'browser'))
+
+import scrapling_executor as executor  # noqa: E402
+
+
+def _stub_page(is_async: bool = False):
+    """Build a page whose methods take Playwright's arguments and record each call."""
+    calls: list[tuple] = []
+
+    def method(name, fn):
+        def sync_call(self, *args, **kwargs):
+            calls.append((name, args, kwargs))
+            return fn(*args, **kwargs)
+
+        async def async_call(self, *args, **kwargs):
+            return sync_call(self, *args, **kwargs)
+
+        return async_call if is_async else sync_call
+
+    locator_methods = {
+        'evaluate': lambda expression, arg=None, *, timeout=None: 'text',
+        'evaluate_all': lambda expression, arg=None: {'count': 2, 'texts': ['a', 'b']},
+        'get_attribute': lambda name, *, timeout=None: f'attr:{name}',
+        'input_value': lambda *, timeout=None: 'value',
+        'scroll_into_view_if_needed': lambda *, timeout=None: None,
+        'blur': lambda *, timeout=None: None,
+    }
+    locator_cls = type('StubLocator', (), {name: method(name, fn) for name, fn in locator_methods.items()})
+    locator_cls.first = property(lambda self: self)
+
+    page_methods = {
+        'screenshot': lambda *, path=None, type=None, quality=None, full_page=None, clip=None, timeout=None: b'',
+        'click': lambda selector, *, timeout=None: None,
+        'fill': lambda selector, value, *, timeout=None: None,
+        'type': lambda selector, text, *, timeout=None: None,
+        'hover': lambda selector, *, timeout=None: None,
+        'press': lambda selector, key, *, timeout=None: None,
+        'select_option': lambda selector, value=None, *, timeout=None: [],
+        'check': lambda selector, *, timeout=None: None,
+        'uncheck': lambda selector, *, timeout=None: None,
+        'wait_for_timeout': lambda timeout: None,
+        'wait_for_selector': lambda selector, *, timeout=None: None,
+        'wait_for_url': lambda url, *, timeout=None: None,
+        'wait_for_load_state': lambda state=None, *, timeout=None: None,
+        'evaluate': lambda expression, arg=None: 2,
+        'go_back': lambda *, timeout=None: None,
+        'go_forward': lambda *, timeout=None: None,
+        'reload': lambda *, timeout=None: None,
+        'focus': lambda selector, *, timeout=None: None,
+        'drag_and_drop': lambda source, target, *, timeout=None: None,
+        'set_input_files': lambda selector, files, *, timeout=None: None,
+        'title': lambda: 'Title',
+    }
+    page_cls = type('StubPage', (), {name: method(name, fn) for name, fn in page_methods.items()})
+    page_cls.url = 'https://example.com/'
+    page_cls.locator = lambda self, selector: calls.append(('locator', (selector,), {})) or locator_cls()
+    page = page_cls()
+    page.calls = calls
+    return page
+
+
+def _run_sync(actions, **kwargs):
+    page = _stub_page()
+    page_action, get_results = executor.create_page_action(executor._to_steps(actions), Path('.'), **kwargs)
+    page_action(page)
+    return get_results(), page
+
+
+def _run_async(actions):
+    page = _stub_page(is_async=True)
+    page_action, get_results = executor.create_page_action_async(executor._to_steps(actions), Path('.'))
+    asyncio.run(page_action(page))
+    return get_results(), page
+
+
+def _without_timing(results):
+    return [{k: v for k, v in r.items() if k != 'elapsed_ms'} for r in results]
+
+
+ALL_ACTIONS = [
+    {'action': action, 'selector': '#s', 'value': '1', 'attribute': 'id', 'timeout': 5000}
+    for action in executor._HANDLERS
+]
+
+
+class StepConversionTests(unittest.TestCase):
+    def test_valid_steps_become_steps(self):
+        steps = executor._to_steps([{'action': 'click', 'selector': '#a', 'unknown': 1}])
+        self.assertEqual(steps, [executor.Step('click', selector='#a')])
+
+    def test_malformed_steps_become_invalid_steps(self):
+        steps = executor._to_steps(['oops', {'selector': '#a'}, {'action': ['x']}, {'action': 'get_url'}])
+        self.assertIsInstance(steps[0], executor.InvalidStep)
+        self.assertIsInstance(steps[1], executor.InvalidStep)
+        self.assertIsInstance(steps[2], executor.InvalidStep)
+        self.assertEqual(steps[2].action, ['x'])
+        self.assertEqual(steps[3], executor.Step('get_url'))
+
+    def test_non_list_actions_are_rejected(self):
+        with self.assertRaises(ValueError):
+            executor._to_steps({'action': 'click'})
+
+    def test_malformed_steps_are_reported_per_step(self):
+        results, _ = _run_sync([{'action': {}}, {'action': 'get_url'}, {'action': 'bogus'}])
+        self.assertEqual([r['status'] for r in results], ['error', 'ok', 'error'])
+        self.assertEqual(results[2]['error'], 'Unknown action: bogus')
+
+    def test_malformed_steps_do_not_affect_network_idle(self):
+        steps = executor._to_steps([{'action': ['reload']}, {'action': {}}, {'action': 'click', 'selector': '#a'}])
+        self.assertFalse(executor._needs_network_idle({}, steps))
+        steps = executor._to_steps([{'action': 'reload'}])
+        self.assertTrue(executor._needs_network_idle({}, steps))
+        self.assertFalse(executor._needs_network_idle({'networkIdle': False}, steps))
+
+
+class HandlerTests(unittest.TestCase):
+    def test_every_action_runs_with_playwright_signatures(self):
+        results, _ = _run_sync(ALL_ACTIONS)
+        failed = [r for r in results if r['status'] != 'ok']
+        self.assertEqual(failed, [])
+
+    def test_evaluate_never_passes_timeout(self):
+        _, page = _run_sync([{'action': 'evaluate', 'value': '1+1', 'timeout': 5000}])
+        self.assertIn(('evaluate', ('1+1',), {}), page.calls)
+
+    def test_sync_and_async_handlers_agree(self):
+        actions = ALL_ACTIONS + [
+            {'action': 'wait', 'value': '7', 'until': '.x'},
+            {'action': 'wait', 'value': '7', 'until': '.x', 'until_kind': 'nope'},
+            {'action': 'get_url'},
+            {'action': 'bogus'},
+            {'selector': '#a'},
+        ]
+        self.assertEqual(executor._HANDLERS.keys(), executor._AHANDLERS.keys())
+        sync_results, sync_page = _run_sync(actions)
+        async_results, async_page = _run_async(actions)
+        self.assertEqual(_without_timing(sync_results), _without_timing(async_results))
+        self.assertEqual(sync_page.calls, async_page.calls)
+
+    def test_locators_are_reused_until_navigation(self):
+        _, page = _run_sync([
+            {'action': 'get_text', 'selector': '#a'},
+            {'action': 'get_value', 'selector': '#a'},
+            {'action': 'reload'},
+            {'action': 'get_text', 'selector': '#a'},
+        ])
+        self.assertEqual(sum(1 for call in page.calls if call[0] == 'locator'), 2)
+
+    def test_screenshot_path_matches_path_join(self):
+        step = executor.Step('screenshot')
+        for out_dir in ('.', 'out', './out', '/tmp/out/'):
+            path = executor._screenshot_kwargs(step, 0, str(Path(out_dir)))['path']
+            self.assertEqual(path, str(Path(out_dir) / 'screenshot-0.png'))
+
+
+class FusedScriptTests(unittest.TestCase):
+    READ_ONLY = [
+        {'action': 'get_text', 'selector': '#a'},
+        {'action': 'get_attribute', 'selector': '#missing'},
+        {'action': 'get_url'},
+        {'action': 'get_title'},
+    ]
+
+    def test_only_read_only_css_lists_are_fused(self):
+        fuse = lambda actions: executor._try_fuse(executor._to_steps(actions))  # noqa: E731
+        self.assertIsNotNone(fuse(self.READ_ONLY))
+        self.assertIsNotNone(fuse([{'action': 'get_text', 'selector': 'ul > li:nth-child(2) a[href=x]'}]))
+        self.assertIsNone(fuse([]))
+        self.assertIsNone(fuse([{'action': 'click', 'selector': '#a'}]))
+        self.assertIsNone(fuse([{'action': 'evaluate', 'value': '1'}]))
+        self.assertIsNone(fuse([{'action': 'get_url'}, {'action': {}}]))
+        for selector in ('text=Hi', 'xpath=//a', '//a', '"Hi"', 'div >> a', 'a:has-text("x")', 'a:visible'):
+            self.assertIsNone(fuse([{'action': 'get_text', 'selector': selector}]), selector)
+
+    @unittest.skipUnless(shutil.which('node'), 'node is not installed')
+    def test_fused_script_answers_each_step(self):
+        script = executor._try_fuse(executor._to_steps(self.READ_ONLY))
+        fake_dom = (
+            "const document = {title: 'T', querySelector: (s) => s === '#a' ? {innerText: 'x\\u{1F600}y'} : null};"
+            "const location = {href: 'https://example.com/'};"
+            'console.log(JSON.stringify(eval(process.argv[1])));'
+        )
+        out = subprocess.run(['node', '-e', fake_dom, script], capture_output=True, text=True, check=True)
+        results = executor._loads(out.stdout)
+        self.assertEqual(results[0]['text'], 'x\U0001F600y')
+        self.assertEqual(results[1]['status'], 'error')
+        self.assertEqual(results[2]['url'], 'https://example.com/')
+        self.assertEqual(results[3]['title'], 'T')
+
+    def test_unanswered_steps_go_through_playwright(self):
+        fused = [
+            {'step': 0, 'action': 'get_text', 'status': 'ok', 'selector': '#a', 'text': 'in page'},
+            {'step': 1, 'action': 'get_attribute', 'status': 'error', 'error': 'No element'},
+            {'step': 2, 'action': 'get_url', 'status': 'ok', 'url': 'in page'},
+            {'step': 3, 'action': 'get_title', 'status': 'ok', 'title': 'in page'},
+        ]
+        with mock.patch.object(executor, '_try_fuse', return_value='script'):
+            page = _stub_page()
+            page.evaluate = lambda script, arg=None: fused
+            page_action, get_results = executor.create_page_action(
+                executor._to_steps(self.READ_ONLY), Path('.'), fuse=True,
+            )
+            page_action(page)
+        results = get_results()
+        self.assertEqual([r['step'] for r in results], [0, 1, 2, 3])
+        self.assertEqual(results[0]['text'], 'in page')
+        self.assertEqual(results[1]['value'], 'attr:href')
+
+    def test_failed_script_drives_every_step(self):
+        def fail(script, arg=None):
+            raise RuntimeError('Execution context was destroyed')
+
+        page = _stub_page()
+        page.evaluate = fail
+        page_action, get_results = executor.create_page_action(
+            executor._to_steps(self.READ_ONLY), Path('.'), fuse=True,
+        )
+        page_action(page)
+        self.assertEqual([r['status'] for r in get_results()], ['ok'] * 4)
+
+
+class _StubResponse:
+    def __init__(self, status: int):
+        self.status = status
+        self.url = 'https://example.com/'
+
+
+class _StubFetcher:
+    """Returns (or raises) the next scripted outcome and records whether solving was asked for."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.solved: list[bool] = []
+
+    def fetch(self, url, **kwargs):
+        self.solved.append(kwargs.get('solve_cloudflare', False))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _StubResponse(outcome)
+
+
+class CloudflareMarkerTests(unittest.TestCase):
+    def setUp(self):
+        self.profile = tempfile.mkdtemp()
+        self.marker = os.path.join(self.profile, executor.CF_MARKER)
+        self.addCleanup(shutil.rmtree, self.profile)
+
+    def _execute(self, fetcher):
+        config = {
+            'url': 'https://example.com/',
+            'method': 'stealthy-fetch',
+            'solveCloudflare': True,
+            'userDataDir': self.profile,
+            'outputDir': self.profile,
+        }
+        with mock.patch.dict(executor._FETCHERS, {'stealthy-fetch': fetcher}):
+            return executor.execute(config)
+
+    def _write_marker(self, age: float = 0):
+        Path(self.marker).touch()
+        stamp = time.time() - age
+        os.utime(self.marker, (stamp, stamp))
+
+    def test_solves_and_writes_marker_without_one(self):
+        fetcher = _StubFetcher(200)
+        self._execute(fetcher)
+        self.assertEqual(fetcher.solved, [True])
+        self.assertTrue(os.path.exists(self.marker))
+
+    def test_solved_but_blocked_writes_no_marker(self):
+        self._execute(_StubFetcher(403))
+        self.assertFalse(os.path.exists(self.marker))
+
+    def test_stale_marker_is_ignored(self):
+        self._write_marker(age=executor.CF_MARKER_TTL + 60)
+        fetcher = _StubFetcher(200)
+        self._execute(fetcher)
+        self.assertEqual(fetcher.solved, [True])
+
+    def test_fresh_marker_skips_solving_and_keeps_its_age(self):
+        self._write_marker(age=60)
+        before = os.path.getmtime(self.marker)
+        fetcher = _StubFetcher(200)
+        self._execute(fetcher)
+        self.assertEqual(fetcher.solved, [False])
+        self.assertEqual(os.path.getmtime(self.marker), before)
+
+    def test_blocked_without_solving_retries_with_solve(self):
+        self._write_marker(age=60)
+        fetcher = _StubFetcher(403, 200)
+        result = self._execute(fetcher)
+        self.assertEqual(fetcher.solved, [False, True])
+        self.assertEqual(result['status'], 200)
+        self.assertLess(time.time() - os.path.getmtime(self.marker), 30)
+
+    def test_error_without_solving_retries_with_solve(self):
+        self._write_marker(age=60)
+        fetcher = _StubFetcher(RuntimeError('challenge page'), 200)
+        result = self._execute(fetcher)
+        self.assertEqual(fetcher.solved, [False, True])
+        self.assertEqual(result['status'], 200)
+        self.assertTrue(os.path.exists(self.marker))
+
+    def test_blocked_twice_drops_marker(self):
+        self._write_marker(age=60)
+        fetcher = _StubFetcher(403, 503)
+        result = self._execute(fetcher)
+        self.assertEqual(fetcher.solved, [False, True])
+        self.assertEqual(result['status'], 503)
+        self.assertFalse(os.path.exists(self.marker))
+
+
+if __name__ == '__main__':
+    unittest.main()